@@ -0,0 +1,388 @@
+# src/evaluate_extraction.py
+
+import os
+import re
+import sys
+import json
+import time
+
+from .llm_extractor import TieredExtractor, FAST_MODEL, STRONG_MODEL
+from .relevance_filter import create_relevance_scorer
+from .rule_extractor import RuleExtractor
+
+# --- Configuration ---
+GOLDEN_SET_FILE = 'data/golden_set.json'
+RUNS_DIR = 'data/eval_runs'
+
+# Each performance mode is a TieredExtractor configuration, optionally with the
+# relevance pre-filter applied to news articles (as in the real pipeline).
+# 'rules_only' uses the regex RuleExtractor and makes no LLM calls.
+PERFORMANCE_MODES = {
+    'strong_only': {'short_text_max_chars': 0},
+    'fast_only': {'strong_model': FAST_MODEL, 'short_text_max_chars': 0},
+    'tiered': {},
+    'tiered_prefiltered': {'prefilter': True},
+    'rules_only': {'extractor': 'rules'},
+}
+MODES_TO_EVALUATE = ['strong_only', 'tiered', 'tiered_prefiltered', 'rules_only']
+
+# Set to True to re-score the responses recorded in RUNS_DIR instead of calling
+# the LLM. Modes without a recorded run are skipped. Set to False to run live
+# (and re-record) every mode in MODES_TO_EVALUATE.
+REPLAY_RECORDED_RUNS = True
+
+# Set to None to evaluate the whole golden set, or a number to evaluate the first N.
+NUM_ITEMS_TO_EVALUATE = None
+
+# Pause between live calls to stay within free-tier limits (not counted as latency).
+REQUEST_DELAY_S = 1
+
+EVALUATED_FIELDS = ['vendor', 'amount', 'coupon_code', 'expiry_date', 'category', 'transaction_type']
+
+# Accuracy is reported and gated separately for each golden-set source, so the
+# news articles are not drowned out by the templated sample messages.
+SOURCES = ['sample_data', 'raw_api_data']
+
+# amount is only scored where the golden label is a real transaction. The golden
+# set leaves it empty for offers and news, but ExtractedInfo does not ask the
+# model to, so a discount in 'amount' there is not counted as an error.
+AMOUNT_SCORED_TYPES = {'Debit', 'Credit', 'Receipt'}
+
+# --- Quality gate ---
+# Every mode is compared per source and per field against the baseline mode. The
+# run fails (non-zero exit code) if a field's F1 drops by more than MAX_F1_DROP
+# below the baseline, or falls under that source's MIN_FIELD_F1. Fields with fewer
+# than MIN_GOLD_VALUES_FOR_GATE gold values in a source are reported but not gated.
+# If no baseline run is available only the absolute floors are checked.
+BASELINE_MODE = 'strong_only'
+MAX_F1_DROP = 0.02
+MIN_FIELD_F1 = {
+    'sample_data': 0.80,
+    'raw_api_data': 0.60,
+}
+MIN_GOLD_VALUES_FOR_GATE = 5
+
+# Approximate input pricing in USD per 1M tokens. Update to match current Gemini pricing.
+MODEL_INPUT_COST_PER_1M_TOKENS = {
+    FAST_MODEL: 0.10,
+    STRONG_MODEL: 0.30,
+}
+CHARS_PER_TOKEN = 4
+# Rough size of the fixed prompt (instructions + JSON schema) sent with every call.
+PROMPT_OVERHEAD_TOKENS = 600
+
+
+def load_golden_set(filepath: str = GOLDEN_SET_FILE):
+    """Loads the labeled examples built by golden_set.py."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _vendor_tokens(value):
+    return re.findall(r'[a-z0-9]+', str(value).lower())
+
+
+def _contains_tokens(tokens, part):
+    return any(tokens[i:i + len(part)] == part for i in range(len(tokens) - len(part) + 1))
+
+
+def field_matches(field: str, expected, predicted):
+    """Compares one predicted field value against the gold value."""
+    if field == 'vendor':
+        # Whole-word match either way, so 'HDFC' matches 'HDFC Bank' but 'a' does not match 'Amazon'.
+        expected, predicted = _vendor_tokens(expected), _vendor_tokens(predicted)
+        if not expected or not predicted:
+            return False
+        return _contains_tokens(predicted, expected) or _contains_tokens(expected, predicted)
+    if field == 'amount':
+        try:
+            return abs(float(expected) - float(predicted)) < 0.01
+        except (TypeError, ValueError):
+            return False
+    if field == 'coupon_code':
+        return str(expected).strip().upper() == str(predicted).strip().upper()
+    return str(expected).strip() == str(predicted).strip()
+
+
+def score_predictions(golden, predictions):
+    """
+    Computes field-level precision and recall.
+
+    A predicted value counts as a true positive only if it matches a non-empty
+    gold value. Any other non-empty prediction is a false positive, and any gold
+    value that was not correctly predicted is a false negative.
+
+    Args:
+        golden (list): Examples from the golden set.
+        predictions (list): One ExtractedInfo-style dictionary (or None) per example.
+
+    Returns:
+        A dictionary mapping each field to its precision, recall, f1 and the number
+        of gold values (support). Scores are None when the field has neither gold
+        values nor predictions in the given examples.
+    """
+    scores = {}
+    for field in EVALUATED_FIELDS:
+        tp = fp = fn = 0
+        for example, prediction in zip(golden, predictions):
+            if field == 'amount' and example['expected'].get('transaction_type') not in AMOUNT_SCORED_TYPES:
+                continue
+            expected = example['expected'].get(field)
+            predicted = (prediction or {}).get(field)
+            if predicted is not None and expected is not None and field_matches(field, expected, predicted):
+                tp += 1
+                continue
+            if predicted is not None:
+                fp += 1
+            if expected is not None:
+                fn += 1
+
+        if tp + fp + fn == 0:
+            scores[field] = {"precision": None, "recall": None, "f1": None, "support": 0}
+            continue
+        precision = tp / (tp + fp) if (tp + fp) else 0.0
+        recall = tp / (tp + fn) if (tp + fn) else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if (precision + recall) else 0.0
+        scores[field] = {"precision": precision, "recall": recall, "f1": f1, "support": tp + fn}
+    return scores
+
+
+def estimate_record_cost(record, tier_models):
+    """Estimates the LLM input cost in USD of one record from the tiers it went through."""
+    cost = 0.0
+    for tier in record.get('tiers', []):
+        tokens = len(record['text']) / CHARS_PER_TOKEN + PROMPT_OVERHEAD_TOKENS
+        cost += tokens / 1_000_000 * MODEL_INPUT_COST_PER_1M_TOKENS.get(tier_models.get(tier), 0.0)
+    return cost
+
+
+def run_mode(mode: str, golden):
+    """
+    Runs one performance mode over the golden set. Every mode except
+    'rules_only' calls the live LLM.
+
+    Returns:
+        A run record with one prediction and latency per example plus the
+        extractor's per-tier stats. This is what gets saved to RUNS_DIR.
+    """
+    config = dict(PERFORMANCE_MODES[mode])
+    use_prefilter = config.pop('prefilter', False)
+    uses_llm = config.pop('extractor', 'tiered') != 'rules'
+    extractor = TieredExtractor(**config) if uses_llm else RuleExtractor()
+    if use_prefilter:
+        score_fn, threshold = create_relevance_scorer()
+
+    records = []
+    for i, example in enumerate(golden):
+        text = example['text']
+        print(f"  [{mode}] {i+1}/{len(golden)}: {text[:60]}...")
+
+        if use_prefilter and example['source'] == 'raw_api_data' and score_fn(text) < threshold:
+            records.append({"text": text, "prediction": None, "latency_s": 0.0, "skipped": True, "tiers": []})
+            continue
+
+        start = time.perf_counter()
+        try:
+            prediction = extractor.invoke({"text_input": text}).model_dump()
+        except Exception as e:
+            print(f"    -> Extraction failed: {e}")
+            prediction = None
+        latency = time.perf_counter() - start
+        # The tiers this request went through, e.g. ['fast', 'strong'] when escalated.
+        tiers = extractor.requests[-1]["path"] if uses_llm else []
+        records.append({"text": text, "prediction": prediction, "latency_s": latency,
+                        "skipped": False, "tiers": tiers})
+
+        if uses_llm:
+            time.sleep(REQUEST_DELAY_S)
+
+    stats = extractor.get_stats()
+    return {
+        "mode": mode,
+        "records": records,
+        "tier_stats": {tier: stats[tier] for tier in ("fast", "strong") if tier in stats},
+    }
+
+
+def load_recorded_run(mode: str):
+    """Loads a previously recorded run for a mode, or returns None if there is none."""
+    path = os.path.join(RUNS_DIR, f"{mode}.json")
+    if not os.path.exists(path):
+        print(f"No recorded run found for '{mode}' at {path}. Run it live first.")
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_run(run):
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    path = os.path.join(RUNS_DIR, f"{run['mode']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(run, f, indent=2, ensure_ascii=False)
+    print(f"Recorded responses for '{run['mode']}' saved to {path}")
+
+
+def summarize_run(golden, run):
+    """
+    Combines accuracy, throughput and cost for one run into a single report.
+
+    Only records whose text is in the given golden set are counted, so accuracy,
+    speed and cost always cover the same examples.
+    """
+    records_by_text = {record['text']: record for record in run['records']}
+    scored = [(example, records_by_text[example['text']]) for example in golden if example['text'] in records_by_text]
+    records = [record for _, record in scored]
+
+    sources = {}
+    for source in SOURCES:
+        examples = [example for example, _ in scored if example['source'] == source]
+        predictions = [record['prediction'] for example, record in scored if example['source'] == source]
+        field_scores = score_predictions(examples, predictions)
+        f1_values = [score['f1'] for score in field_scores.values() if score['f1'] is not None]
+        sources[source] = {
+            "examples": len(examples),
+            "fields": field_scores,
+            "mean_f1": sum(f1_values) / len(f1_values) if f1_values else None,
+        }
+
+    tier_models = {tier: stats['model'] for tier, stats in run['tier_stats'].items()}
+    latencies = sorted(record['latency_s'] for record in records if not record.get('skipped'))
+    fast_first = [record for record in records if record.get('tiers', [])[:1] == ['fast']]
+    escalated = [record for record in fast_first if len(record['tiers']) > 1]
+
+    return {
+        "mode": run['mode'],
+        "examples": len(records),
+        "sources": sources,
+        "throughput_per_s": len(records) / sum(latencies) if sum(latencies) else 0.0,
+        "median_latency_s": latencies[len(latencies) // 2] if latencies else None,
+        "llm_calls": sum(len(record.get('tiers', [])) for record in records),
+        "skipped": sum(1 for record in records if record.get('skipped')),
+        "escalation_rate": len(escalated) / len(fast_first) if fast_first else 0.0,
+        "estimated_cost_usd": sum(estimate_record_cost(record, tier_models) for record in records),
+    }
+
+
+def _format_score(value):
+    return f"{value:.2f}" if value is not None else "n/a"
+
+
+def print_report(summaries):
+    for source in SOURCES:
+        print(f"\n--- Field-level precision / recall: {source} ---")
+        header = f"{'mode':<20}{'examples':>9}" + "".join(f"{field:>18}" for field in EVALUATED_FIELDS)
+        print(header)
+        for summary in summaries:
+            source_summary = summary['sources'][source]
+            row = f"{summary['mode']:<20}{source_summary['examples']:>9}"
+            for field in EVALUATED_FIELDS:
+                score = source_summary['fields'][field]
+                cell = "n/a" if score['f1'] is None else f"{score['precision']:.2f}/{score['recall']:.2f}"
+                row += f"{cell:>18}"
+            print(row)
+
+    print("\n--- Speed vs accuracy ---")
+    f1_headers = "".join(f"{'f1 ' + source:>18}" for source in SOURCES)
+    print(f"{'mode':<20}{f1_headers}{'items/s':>9}{'median_s':>10}{'llm_calls':>11}"
+          f"{'skipped':>9}{'escalated':>11}{'est_cost_usd':>14}")
+    for summary in sorted(summaries, key=lambda s: s['estimated_cost_usd']):
+        f1_cells = "".join(f"{_format_score(summary['sources'][source]['mean_f1']):>18}" for source in SOURCES)
+        median = summary['median_latency_s']
+        median_str = f"{median:.3f}" if median is not None else "n/a"
+        print(
+            f"{summary['mode']:<20}{f1_cells}{summary['throughput_per_s']:>9.2f}{median_str:>10}"
+            f"{summary['llm_calls']:>11}{summary['skipped']:>9}{summary['escalation_rate']:>11.0%}"
+            f"{summary['estimated_cost_usd']:>14.5f}"
+        )
+
+
+def check_quality_gate(summaries, baseline):
+    """
+    Compares each mode's per-source, per-field F1 against the baseline and the
+    absolute floor for that source.
+
+    Returns:
+        A list of human-readable failures. An empty list means every mode passed.
+    """
+    failures = []
+    for summary in summaries:
+        for source in SOURCES:
+            for field in EVALUATED_FIELDS:
+                score = summary['sources'][source]['fields'][field]
+                if score['f1'] is None or score['support'] < MIN_GOLD_VALUES_FOR_GATE:
+                    continue
+                label = f"{summary['mode']} [{source}]: {field} F1 {score['f1']:.3f}"
+                if score['f1'] < MIN_FIELD_F1[source]:
+                    failures.append(f"{label} is below the floor of {MIN_FIELD_F1[source]:.2f}")
+                if baseline is None or summary['mode'] == baseline['mode']:
+                    continue
+                baseline_f1 = baseline['sources'][source]['fields'][field]['f1']
+                if baseline_f1 is not None and score['f1'] < baseline_f1 - MAX_F1_DROP:
+                    failures.append(
+                        f"{label} is more than {MAX_F1_DROP:.2f} below {baseline['mode']} ({baseline_f1:.3f})"
+                    )
+    return failures
+
+
+def evaluate():
+    """
+    Runs (or replays) every configured mode, prints the comparison report and
+    applies the quality gate.
+
+    Returns:
+        True if every evaluated mode passed the gate, False otherwise.
+    """
+    print("--- Starting Extraction Benchmark ---")
+
+    try:
+        golden = load_golden_set()
+    except FileNotFoundError:
+        print(f"Error: {GOLDEN_SET_FILE} not found. Please run golden_set.py first.")
+        return False
+
+    if NUM_ITEMS_TO_EVALUATE is not None:
+        golden = golden[:NUM_ITEMS_TO_EVALUATE]
+    print(f"Evaluating {len(golden)} labeled examples.")
+
+    summaries = []
+    for mode in MODES_TO_EVALUATE:
+        if REPLAY_RECORDED_RUNS:
+            run = load_recorded_run(mode)
+            if run is None:
+                continue
+        else:
+            try:
+                run = run_mode(mode, golden)
+            except Exception as e:
+                print(f"Error running mode '{mode}': {e}")
+                continue
+            save_run(run)
+        summaries.append(summarize_run(golden, run))
+
+    if not summaries:
+        print("No runs were available to evaluate.")
+        return False
+
+    print_report(summaries)
+
+    baseline = next((summary for summary in summaries if summary['mode'] == BASELINE_MODE), None)
+    if baseline is None and BASELINE_MODE not in MODES_TO_EVALUATE:
+        baseline_run = load_recorded_run(BASELINE_MODE)
+        if baseline_run is not None:
+            baseline = summarize_run(golden, baseline_run)
+    if baseline is None:
+        print(f"\nBaseline '{BASELINE_MODE}' is not available; only the absolute F1 floors are checked.")
+
+    failures = check_quality_gate(summaries, baseline)
+    if failures:
+        print("\n--- Quality gate FAILED ---")
+        for failure in failures:
+            print(f"  {failure}")
+        return False
+
+    print("\n--- Quality gate passed ---")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if evaluate() else 1)
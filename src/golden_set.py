@@ -0,0 +1,121 @@
+# src/golden_set.py
+
+import re
+import json
+from datetime import datetime
+import pandas as pd
+
+from .vendors import VENDOR_CATEGORIES
+
+# --- Configuration ---
+SAMPLE_DATA_FILE = 'data/sample_data.csv'
+RAW_API_DATA_FILE = 'data/raw_api_data.json'
+# Hand-written labels for news articles from raw_api_data.json: every article in the
+# 'tuning' split of relevance_labels.json (offers and non-offers) plus the articles
+# in processed_offers_from_api.csv. Conventions for news:
+# - transaction_type is 'Offer' for articles with a usable deal, otherwise 'Info'.
+# - vendor is the merchant selling the deal (or the brand offering it); for 'Info'
+#   articles it is the main company the article is about, if any.
+# - amount is left empty, as for sample offers (see below).
+NEWS_LABELS_FILE = 'data/news_labels.json'
+GOLDEN_SET_FILE = 'data/golden_set.json'
+
+# Each pattern matches one message template in sample_data.csv.
+# Named groups are mapped onto ExtractedInfo fields by _label_from_match.
+# For offers, 'amount' is left empty: the discount belongs in offer_details.
+# expiry_date is only set when the text says when the offer ends.
+SAMPLE_TEMPLATES = [
+    ('Offer', r"Enjoy (?P<offer>.+?) on your next order from (?P<vendor>.+?) with code (?P<code>\w+)\. Hurry, offer expires (?P<expiry>[\w-]+)\."),
+    ('Offer', r"DEAL! Get (?P<offer>.+?) at (?P<vendor>.+?)\. Use code: (?P<code>\w+)\. Valid till (?P<expiry>[\w-]+)\."),
+    ('Offer', r"Don't miss out! (?P<vendor>.+?) is giving (?P<offer>.+?)\. CODE: (?P<code>\w+)\. Valid until (?P<expiry>[\w-]+)\."),
+    ('Debit', r"Rs\.(?P<amount>[\d.]+) debited from your \w+ A/c \w+ on [\d-]+ for a purchase at (?P<vendor>.+?)\."),
+    ('Debit', r"A spend of Rs\. (?P<amount>[\d.]+) has been made using your \w+ Bank card at (?P<vendor>.+?)\."),
+    ('Debit', r"has been debited for INR (?P<amount>[\d.]+) on [\d-]+\. Info: (?P<vendor>.+?)\."),
+    ('Credit', r"Rs\. (?P<amount>[\d.]+) credited to your (?P<bank>\w+) A/c"),
+    ('Credit', r"You have received Rs\. (?P<amount>[\d.]+) in your (?P<bank>\w+) Bank A/c"),
+    ('Credit', r"Alert: Your account \w+ is credited with INR (?P<amount>[\d.]+?)\.?$"),
+    ('Receipt', r"Your order #\d+ from (?P<vendor>.+?) for Rs\. (?P<amount>[\d.]+) is confirmed\."),
+    ('Receipt', r"Thanks for shopping with (?P<vendor>.+?)! Your order for '.+?' worth Rs\. (?P<amount>[\d.]+) has been"),
+    ('Info', r"Order Update: Your (?P<vendor>.+?) order with ID \d+ has been shipped\."),
+]
+
+
+def _parse_expiry(value: str):
+    """Converts dates like '15-Oct-2025' to '2025-10-15'."""
+    return datetime.strptime(value, '%d-%b-%Y').strftime('%Y-%m-%d')
+
+
+def _label_from_match(transaction_type: str, match):
+    groups = match.groupdict()
+    vendor = groups.get('vendor')
+    if groups.get('bank'):
+        vendor = f"{groups['bank']} Bank"
+
+    if transaction_type == 'Credit':
+        category = 'Finance'
+    else:
+        category = VENDOR_CATEGORIES.get(vendor, 'Other')
+
+    return {
+        "transaction_type": transaction_type,
+        "vendor": vendor,
+        "amount": float(groups['amount']) if groups.get('amount') else None,
+        "offer_details": groups.get('offer'),
+        "coupon_code": groups.get('code'),
+        "expiry_date": _parse_expiry(groups['expiry']) if groups.get('expiry') else None,
+        "category": category,
+    }
+
+
+def label_sample_text(text: str):
+    """Returns the gold label for a templated sample message, or None if no template matches."""
+    for transaction_type, pattern in SAMPLE_TEMPLATES:
+        match = re.search(pattern, text)
+        if match:
+            return _label_from_match(transaction_type, match)
+    return None
+
+
+def build_golden_set():
+    """
+    Builds the labeled golden set used by the extraction benchmark.
+
+    Sample messages are labeled deterministically from their templates. News
+    articles are taken from the hand-corrected labels in NEWS_LABELS_FILE; any
+    that no longer appear in raw_api_data.json are skipped.
+
+    Returns:
+        A list of dictionaries with 'text', 'source' and 'expected' keys.
+    """
+    golden = []
+
+    sample_df = pd.read_csv(SAMPLE_DATA_FILE)
+    sample_df.dropna(subset=['text_input'], inplace=True)
+    unmatched = 0
+    for text in sample_df['text_input']:
+        label = label_sample_text(text)
+        if label is None:
+            unmatched += 1
+            continue
+        golden.append({"text": text, "source": "sample_data", "expected": label})
+    if unmatched:
+        print(f"Warning: {unmatched} sample messages did not match any template and were skipped.")
+
+    with open(RAW_API_DATA_FILE, 'r', encoding='utf-8') as f:
+        raw_texts = {item.get("raw_text") for item in json.load(f)}
+
+    with open(NEWS_LABELS_FILE, 'r', encoding='utf-8') as f:
+        news_labels = json.load(f)
+    for item in news_labels:
+        if item['text'] not in raw_texts:
+            continue
+        golden.append({"text": item['text'], "source": "raw_api_data", "expected": item['expected']})
+
+    return golden
+
+
+if __name__ == "__main__":
+    golden = build_golden_set()
+    with open(GOLDEN_SET_FILE, 'w', encoding='utf-8') as f:
+        json.dump(golden, f, indent=2, ensure_ascii=False)
+    print(f"Saved {len(golden)} labeled examples to {GOLDEN_SET_FILE}")
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
+import statistics
+import time
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
@@ -34,22 +36,35 @@ class ExtractedInfo(BaseModel):
 
 load_dotenv()
 
-def get_llm():
+# --- Model tiers ---
+# Short, templated texts (SMS alerts, coupon messages) go to the fast tier first.
+# Anything long, or anything the fast tier gets wrong, goes to the strong tier.
+FAST_MODEL = "gemini-2.5-flash-lite"
+STRONG_MODEL = "gemini-2.5-flash"
+SHORT_TEXT_MAX_CHARS = 300
+
+VALID_TRANSACTION_TYPES = {'Offer', 'Debit', 'Credit', 'Receipt', 'Info'}
+VALID_CATEGORIES = {
+    'Food & Dining', 'Shopping', 'Travel', 'Bills & Utilities',
+    'Groceries', 'Entertainment', 'Finance', 'Other'
+}
+
+def get_llm(model: str = STRONG_MODEL):
     """Initializes and returns the shared Gemini LLM model."""
     llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
+        model=model,
         temperature=0,
         convert_system_message_to_human=True
     )
     return llm
 
-def create_extraction_chain():
+def create_extraction_chain(model: str = STRONG_MODEL, max_attempts: int = 2):
     """
     Initializes and returns a Langchain chain configured for financial text extraction using Google Gemini.
     This version includes a retry mechanism for robustness.
     """
     
-    llm = get_llm()
+    llm = get_llm(model)
     
     parser = PydanticOutputParser(pydantic_object=ExtractedInfo)
     
@@ -72,9 +87,125 @@ def create_extraction_chain():
     
     chain = prompt | llm | parser
     
-    chain_with_retries = chain.with_retry(stop_after_attempt=2)
+    chain_with_retries = chain.with_retry(stop_after_attempt=max_attempts)
     
     return chain_with_retries
+
+
+def find_extraction_issues(result: ExtractedInfo):
+    """
+    Checks an extraction result for missing or inconsistent fields.
+
+    Returns:
+        A list of human-readable problems. An empty list means the result looks usable.
+    """
+    issues = []
+    if result.transaction_type not in VALID_TRANSACTION_TYPES:
+        issues.append(f"unknown transaction_type '{result.transaction_type}'")
+    if result.category not in VALID_CATEGORIES:
+        issues.append(f"unknown category '{result.category}'")
+    # vendor is optional (e.g. a bare account credit alert), but a merchant is always named
+    # in offers, receipts and card/account debits.
+    if result.transaction_type in ('Offer', 'Receipt', 'Debit') and not result.vendor:
+        issues.append(f"{result.transaction_type} without vendor")
+    if result.transaction_type == 'Offer' and not result.offer_details:
+        issues.append("Offer without offer_details")
+    if result.transaction_type in ('Debit', 'Credit') and result.amount is None:
+        issues.append(f"{result.transaction_type} without amount")
+    return issues
+
+
+class TieredExtractor:
+    """
+    Routes each text to the cheapest model tier that can handle it.
+
+    Short texts are tried on the fast tier first and escalated to the strong tier
+    when parsing fails or the result fails validation. Long texts go straight to
+    the strong tier. Exposes the same invoke({"text_input": ...}) interface as
+    the chain returned by create_extraction_chain.
+    """
+
+    def __init__(self, fast_model: str = FAST_MODEL, strong_model: str = STRONG_MODEL,
+                 short_text_max_chars: int = SHORT_TEXT_MAX_CHARS):
+        # The fast tier gets a single attempt; escalation is its retry.
+        self.fast_chain = create_extraction_chain(fast_model, max_attempts=1)
+        self.strong_chain = create_extraction_chain(strong_model)
+        self.models = {"fast": fast_model, "strong": strong_model}
+        self.short_text_max_chars = short_text_max_chars
+        self.latencies = {"fast": [], "strong": []}
+        self.input_chars = {"fast": 0, "strong": 0}
+        # One entry per invoke(): total latency and the tiers it went through.
+        self.requests = []
+        self.escalations = 0
+        self.fast_attempts = 0
+
+    def _timed_invoke(self, tier: str, chain, text: str, path: list):
+        path.append(tier)
+        self.input_chars[tier] += len(text)
+        start = time.perf_counter()
+        try:
+            return chain.invoke({"text_input": text})
+        finally:
+            self.latencies[tier].append(time.perf_counter() - start)
+
+    def invoke(self, inputs: dict) -> ExtractedInfo:
+        text = inputs["text_input"]
+        path = []
+        start = time.perf_counter()
+        try:
+            return self._route(text, path)
+        finally:
+            self.requests.append({"path": path, "latency_s": time.perf_counter() - start})
+
+    def _route(self, text: str, path: list) -> ExtractedInfo:
+        if len(text) <= self.short_text_max_chars:
+            self.fast_attempts += 1
+            try:
+                result = self._timed_invoke("fast", self.fast_chain, text, path)
+                issues = find_extraction_issues(result)
+                if not issues:
+                    return result
+                print(f"    -> Escalating to strong tier: {', '.join(issues)}")
+            except Exception as e:
+                print(f"    -> Escalating to strong tier: fast tier failed ({e})")
+            self.escalations += 1
+
+        return self._timed_invoke("strong", self.strong_chain, text, path)
+
+    def get_stats(self):
+        """
+        Returns per-tier call counts, input size and median latency, the escalation
+        rate, and the end-to-end median latency per request. An escalated request's
+        end-to-end latency includes both its fast and strong calls.
+        """
+        stats = {}
+        for tier, latencies in self.latencies.items():
+            stats[tier] = {
+                "model": self.models[tier],
+                "calls": len(latencies),
+                "input_chars": self.input_chars[tier],
+                "median_latency_s": statistics.median(latencies) if latencies else None,
+            }
+        stats["escalation_rate"] = self.escalations / self.fast_attempts if self.fast_attempts else 0.0
+
+        totals = [request["latency_s"] for request in self.requests]
+        paths = {}
+        for request in self.requests:
+            key = ">".join(request["path"])
+            paths[key] = paths.get(key, 0) + 1
+        stats["overall"] = {
+            "requests": len(totals),
+            "median_latency_s": statistics.median(totals) if totals else None,
+            "paths": paths,
+        }
+        return stats
+
+
+def create_tiered_extractor():
+    """Initializes and returns a TieredExtractor using the configured model tiers."""
+    return TieredExtractor()
+
+
 if __name__ == '__main__':
     extraction_chain = create_extraction_chain()
     
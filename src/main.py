@@ -2,7 +2,7 @@
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 
-from .llm_extractor import create_extraction_chain, ExtractedInfo
+from .llm_extractor import create_tiered_extractor, ExtractedInfo
 app = FastAPI(
     title="FlipSave API",
     description="An API to extract and categorize information from financial texts.",
@@ -10,7 +10,7 @@ app = FastAPI(
 )
 
 try:
-    extraction_chain = create_extraction_chain()
+    extraction_chain = create_tiered_extractor()
 except Exception as e:
     extraction_chain = None
     print(f"Error creating extraction chain on startup: {e}")
@@ -23,7 +23,8 @@ async def process_text(request: TextInput):
     """
     Accepts a raw text string and returns structured financial information.
     
-    This endpoint processes the input text using the Gemini-powered extraction chain.
+    This endpoint processes the input text using the Gemini-powered extraction chain,
+    starting on the fast model tier and escalating to the strong tier when needed.
     """
     if extraction_chain is None:
         raise HTTPException(
@@ -41,6 +42,16 @@ async def process_text(request: TextInput):
             detail=f"An error occurred while processing the text: {e}"
         )
 
+@app.get("/stats/")
+def read_stats():
+    """Returns per-tier call counts, median latency and the escalation rate."""
+    if extraction_chain is None:
+        raise HTTPException(
+            status_code=500, 
+            detail="Internal Server Error: Extraction chain is not available."
+        )
+    return extraction_chain.get_stats()
+
 @app.get("/")
 def read_root():
     return {"status": "FlipSave API is running"}
@@ -3,7 +3,8 @@
 import json
 import pandas as pd
 import time
-from .llm_extractor import create_extraction_chain
+from .llm_extractor import create_tiered_extractor
+from .relevance_filter import create_relevance_scorer, filter_relevant_items
 
 # --- Configuration ---
 INPUT_FILE = 'data/raw_api_data.json'
@@ -11,6 +12,9 @@ OUTPUT_FILE = 'data/processed_offers_from_api.csv'
 # --- NEW: Add a variable to control how many items to process ---
 # Set to None to process all items, or a number to process just the top N.
 NUM_ITEMS_TO_PROCESS = 10
+# Skip articles the cheap local pre-filter thinks contain no offer, so LLM calls
+# are spent on real deals. Thresholds live in relevance_filter.py.
+USE_RELEVANCE_FILTER = True
 
 def transform_raw_data():
     """
@@ -27,6 +31,11 @@ def transform_raw_data():
         print(f"Error: {INPUT_FILE} not found. Please run the api_client.py script first.")
         return
 
+    if USE_RELEVANCE_FILTER:
+        score_fn, threshold = create_relevance_scorer()
+        raw_data, skipped = filter_relevant_items(raw_data, score_fn, threshold)
+        print(f"Relevance pre-filter kept {len(raw_data)} articles and skipped {len(skipped)} likely non-offers.")
+
     # --- NEW: Slice the data before processing ---
     if NUM_ITEMS_TO_PROCESS is not None:
         data_to_process = raw_data[:NUM_ITEMS_TO_PROCESS]
@@ -37,8 +46,8 @@ def transform_raw_data():
     # ---------------------------------------------
 
     try:
-        extraction_chain = create_extraction_chain()
-        print("Successfully initialized the Gemini extraction chain.")
+        extraction_chain = create_tiered_extractor()
+        print("Successfully initialized the tiered Gemini extraction chain.")
     except Exception as e:
         print(f"Error initializing the extraction chain: {e}")
         return
@@ -80,6 +89,21 @@ def transform_raw_data():
     print(f"Successfully processed and saved {len(structured_results)} items.")
     print(f"Clean, structured data has been saved to: {OUTPUT_FILE}")
 
+    stats = extraction_chain.get_stats()
+    print("\n--- Model tier stats ---")
+    for tier in ("fast", "strong"):
+        median = stats[tier]["median_latency_s"]
+        median_str = f"{median:.2f}s" if median is not None else "n/a"
+        print(f"  {tier.title()} tier: {stats[tier]['calls']} calls, median latency {median_str}")
+    print(f"  Escalation rate: {stats['escalation_rate']:.0%}")
+    print("  (Fast-tier calls and latencies include attempts that were later escalated to the strong tier.)")
+    overall = stats["overall"]
+    median = overall["median_latency_s"]
+    median_str = f"{median:.2f}s" if median is not None else "n/a"
+    print(f"  End-to-end: {overall['requests']} requests, median latency {median_str} "
+          f"(escalated requests include both tiers)")
+    print(f"  Tier paths: {overall['paths']}")
+
 
 if __name__ == "__main__":
     transform_raw_data()
\ No newline at end of file
@@ -0,0 +1,284 @@
+# src/relevance_filter.py
+
+import re
+import json
+import pandas as pd
+
+# --- Configuration ---
+LABELED_DATA_FILE = 'data/processed_offers_from_api.csv'
+# Hand-labeled articles from raw_api_data.json, in two splits:
+# - 'tuning' (every 4th article from index 0): the keyword weights and threshold
+#   were tuned on it, and 'model' mode trains on it.
+# - 'held_out' (every 4th article from index 2): never used for tuning or training.
+#   Report recall on this split when changing the filter.
+HAND_LABELED_FILE = 'data/relevance_labels.json'
+RAW_API_DATA_FILE = 'data/raw_api_data.json'
+
+# Articles scoring below this are skipped before they reach the LLM.
+# Lower it to let more borderline articles through (higher recall, more LLM calls).
+# A single deal/sale/discount mention is enough to keep an article.
+RELEVANCE_THRESHOLD = 1.0
+
+# Below these sizes a label set is reported as too small to tune a threshold on.
+MIN_LABELS_FOR_TUNING = 50
+MIN_NEGATIVES_FOR_TUNING = 10
+
+# Choose the scoring backend: 'keyword' (no extra dependencies) or 'model'
+# (a small TF-IDF + logistic regression model trained on the 'tuning' split).
+# Run this module to see precision/recall for both before changing it.
+FILTER_MODE = 'keyword'
+MODEL_THRESHOLD = 0.5
+
+# Phrases that usually mean an article carries a concrete, usable offer.
+OFFER_KEYWORDS = {
+    r'\d+\s?%\s?off': 3.0,
+    r'(?:rs\.?|₹|\$|£)\s?[\d,.]+\s?off': 3.0,
+    r'\bcoupon\b': 3.0,
+    r'\bpromo(?:tional)? code\b': 3.0,
+    r'\buse code\b': 3.0,
+    r'\bcashback\b': 2.0,
+    r'\d+\s?percent off': 3.0,
+    r'\bdown\s\d+\s?%': 3.0,
+    r'\bhalf (?:off|price)\b': 3.0,
+    r'\bprice (?:drops?|cut)\b': 2.0,
+    r'\b(?:record|all-time) lows?\b': 2.0,
+    r'\bdiscount(?:s|ed)?\b': 1.5,
+    r'\bdown to\b': 1.5,
+    r'\blowest price': 1.5,
+    r'\bcheap(?:er|est)\b': 1.5,
+    r'\bfor free\b': 1.5,
+    r'\bon sale\b': 1.5,
+    r'\bclear(?:ing|s)? out\b': 1.5,
+    r'\bsales?\b': 1.0,
+    r'\bsave\b': 1.0,
+    r'\bsavings\b': 1.0,
+    r'\bdeals?\b': 1.0,
+    r'(?:rs\.?|₹|\$|£)\s?\d': 1.0,
+    r'\bvalid till\b': 1.0,
+}
+
+# Phrases that usually mean the article is news or commentary, not an offer.
+NON_OFFER_KEYWORDS = {
+    r'\blawsuit\b': -2.0,
+    r'\bearnings\b': -2.0,
+    r'\bshares?\b': -1.0,
+    r'\bstock (?:market|price)s?\b': -1.0,
+    r'\breview\b': -1.0,
+    r'\blayoffs?\b': -2.0,
+}
+
+
+def keyword_score(raw_text: str) -> float:
+    """Scores a text by summing the weights of the offer / non-offer keywords it contains."""
+    text = raw_text.lower()
+    score = 0.0
+    for pattern, weight in {**OFFER_KEYWORDS, **NON_OFFER_KEYWORDS}.items():
+        if re.search(pattern, text):
+            score += weight
+    return score
+
+
+def load_labeled_texts(filepath: str = LABELED_DATA_FILE):
+    """
+    Loads past LLM extraction results as training / evaluation labels.
+
+    Returns:
+        A tuple of (texts, labels) where a label is 1 if the LLM classified the
+        article as an 'Offer' and 0 otherwise.
+    """
+    df = pd.read_csv(filepath)
+    df.dropna(subset=['original_text', 'transaction_type'], inplace=True)
+    labels = (df['transaction_type'] == 'Offer').astype(int).tolist()
+    return df['original_text'].tolist(), labels
+
+
+def load_hand_labeled_texts(filepath: str = HAND_LABELED_FILE, split: str = None):
+    """
+    Loads the hand-labeled relevance articles, optionally from one split only.
+
+    Returns:
+        A tuple of (texts, labels) where a label is 1 if the article contains a
+        usable offer. Duplicate articles are dropped.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    labeled = {
+        item["raw_text"]: item["is_offer"] for item in items
+        if split is None or item["split"] == split
+    }
+    return list(labeled.keys()), list(labeled.values())
+
+
+def describe_label_set(name: str, labels):
+    """Prints the size of a label set and warns if it is too small to tune a threshold on."""
+    negatives = labels.count(0)
+    print(f"{name}: {len(labels)} articles ({len(labels) - negatives} offers, {negatives} non-offers)")
+    if len(labels) < MIN_LABELS_FOR_TUNING or negatives < MIN_NEGATIVES_FOR_TUNING:
+        print("  Warning: this label set is too small to tune a threshold on.")
+
+
+def cross_validate_model(texts, labels, folds: int = 5):
+    """
+    Scores every text with a relevance model that never saw it during training.
+
+    Returns:
+        A dictionary mapping each text to its out-of-fold offer probability.
+    """
+    from sklearn.model_selection import StratifiedKFold
+
+    probabilities = {}
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    for train_idx, test_idx in splitter.split(texts, labels):
+        model = train_relevance_model([texts[i] for i in train_idx], [labels[i] for i in train_idx])
+        fold_probabilities = model.predict_proba([texts[i] for i in test_idx])[:, 1]
+        for i, probability in zip(test_idx, fold_probabilities):
+            probabilities[texts[i]] = float(probability)
+    return probabilities
+
+
+def train_relevance_model(texts, labels):
+    """
+    Trains a small TF-IDF + logistic regression classifier on labeled texts.
+
+    Requires scikit-learn. Both classes must be present in the labels.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+
+    model = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), min_df=1, sublinear_tf=True),
+        LogisticRegression(class_weight='balanced', max_iter=1000)
+    )
+    model.fit(texts, labels)
+    return model
+
+
+def create_relevance_scorer(mode: str = FILTER_MODE, labeled_file: str = HAND_LABELED_FILE):
+    """
+    Builds the scoring function used by the pre-filter.
+
+    Returns:
+        A tuple of (score_fn, threshold). score_fn takes a raw text and returns a
+        float; texts scoring at or above the threshold are treated as likely offers.
+        Falls back to keyword scoring if the model cannot be trained.
+    """
+    if mode == 'model':
+        try:
+            texts, labels = load_hand_labeled_texts(labeled_file, split='tuning')
+            model = train_relevance_model(texts, labels)
+            print(f"Trained relevance model on {len(texts)} labeled articles.")
+            return (lambda text: float(model.predict_proba([text])[0][1])), MODEL_THRESHOLD
+        except Exception as e:
+            print(f"Could not train relevance model ({e}). Falling back to keyword scoring.")
+
+    return keyword_score, RELEVANCE_THRESHOLD
+
+
+def filter_relevant_items(items, score_fn=keyword_score, threshold: float = RELEVANCE_THRESHOLD):
+    """
+    Splits raw items into likely offers and likely non-offers.
+
+    Args:
+        items (list): Dictionaries with a 'raw_text' key, as returned by fetch_news_data.
+        score_fn (callable): Function mapping a raw text to a relevance score.
+        threshold (float): Minimum score for an item to be kept.
+
+    Returns:
+        A tuple of (kept, skipped). Kept items are ordered by descending score so
+        the most promising articles are sent to the LLM first.
+    """
+    scored = []
+    skipped = []
+    for item in items:
+        raw_text = item.get("raw_text")
+        if not raw_text:
+            continue
+        score = score_fn(raw_text)
+        if score >= threshold:
+            scored.append((score, item))
+        else:
+            skipped.append(item)
+
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    kept = [item for _, item in scored]
+    return kept, skipped
+
+
+def evaluate_filter(texts, labels, score_fn=keyword_score, threshold: float = RELEVANCE_THRESHOLD):
+    """
+    Reports how well the pre-filter agrees with a set of offer / non-offer labels.
+
+    Returns:
+        A dictionary with precision, recall, the number of LLM calls saved and
+        the number of real offers that would have been dropped.
+    """
+    tp = fp = fn = tn = 0
+    for text, label in zip(texts, labels):
+        predicted = score_fn(text) >= threshold
+        if predicted and label:
+            tp += 1
+        elif predicted and not label:
+            fp += 1
+        elif not predicted and label:
+            fn += 1
+        else:
+            tn += 1
+
+    return {
+        "threshold": threshold,
+        "precision": tp / (tp + fp) if (tp + fp) else 0.0,
+        "recall": tp / (tp + fn) if (tp + fn) else 0.0,
+        "llm_calls_saved": fn + tn,
+        "offers_dropped": fn,
+        "total": len(texts),
+    }
+
+
+def print_report(name: str, texts, labels, score_fn, thresholds):
+    print(f"\n{name}")
+    for threshold in thresholds:
+        report = evaluate_filter(texts, labels, score_fn, threshold)
+        print(
+            f"  threshold={threshold:.2f}: precision={report['precision']:.2f} "
+            f"recall={report['recall']:.2f} saved={report['llm_calls_saved']}/{report['total']} "
+            f"dropped_offers={report['offers_dropped']}"
+        )
+
+
+if __name__ == "__main__":
+    print("--- Evaluating relevance pre-filter ---")
+    past_texts, past_labels = load_labeled_texts()
+    describe_label_set("Past LLM labels", past_labels)
+    tuning_texts, tuning_labels = load_hand_labeled_texts(split='tuning')
+    describe_label_set("Hand-labeled 'tuning' split", tuning_labels)
+    held_out_texts, held_out_labels = load_hand_labeled_texts(split='held_out')
+    describe_label_set("Hand-labeled 'held_out' split", held_out_labels)
+
+    print_report("Keyword scoring on the 'tuning' split (in-sample: the keywords were tuned on it):",
+                 tuning_texts, tuning_labels, keyword_score, [0.5, 1.0, 1.5, 2.0, 3.0])
+    print_report("Keyword scoring on the 'held_out' split:",
+                 held_out_texts, held_out_labels, keyword_score, [0.5, 1.0, 1.5, 2.0, 3.0])
+
+    try:
+        model = train_relevance_model(past_texts, past_labels)
+        past_label_score = lambda text: float(model.predict_proba([text])[0][1])
+        print_report("Model trained on past LLM labels, scored on the 'held_out' split:",
+                     held_out_texts, held_out_labels, past_label_score, [0.3, 0.5, 0.7])
+
+        probabilities = cross_validate_model(tuning_texts, tuning_labels)
+        print_report("Model cross-validated (5 folds) on the 'tuning' split:",
+                     tuning_texts, tuning_labels, probabilities.get, [0.3, 0.5, 0.7])
+
+        model = train_relevance_model(tuning_texts, tuning_labels)
+        tuning_score = lambda text: float(model.predict_proba([text])[0][1])
+        print_report("Model trained on the 'tuning' split, scored on the 'held_out' split:",
+                     held_out_texts, held_out_labels, tuning_score, [0.3, 0.5, 0.7])
+    except ImportError:
+        print("\nscikit-learn is not installed; skipping the 'model' mode evaluation.")
+
+    with open(RAW_API_DATA_FILE, 'r', encoding='utf-8') as f:
+        raw_data = json.load(f)
+    kept, skipped = filter_relevant_items(raw_data, keyword_score, RELEVANCE_THRESHOLD)
+    print(f"\nOn the full feed ({RAW_API_DATA_FILE}) the default keyword filter keeps {len(kept)} "
+          f"and skips {len(skipped)} articles.")
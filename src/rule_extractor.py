@@ -0,0 +1,85 @@
+# src/rule_extractor.py
+
+import re
+from datetime import datetime
+
+from .llm_extractor import ExtractedInfo
+from .vendors import VENDOR_CATEGORIES
+
+# --- Configuration ---
+# Checked in order; the first match decides the transaction type.
+TRANSACTION_TYPE_PATTERNS = [
+    ('Debit', r'\bdebited\b|\bspend of\b|\bspent\b'),
+    ('Credit', r'\bcredited\b|\breceived\b'),
+    ('Receipt', r'\border\b.*\b(?:confirmed|placed)\b'),
+    ('Info', r'\bshipped\b|\bdelivered\b'),
+    ('Offer', r'\boff\b|\bcode\b|\boffer\b|\bdeals?\b|\bsale\b|\bdiscount'),
+]
+
+AMOUNT_PATTERN = r'(?:Rs\.?|INR|₹)\s?([\d,]+(?:\.\d+)?)'
+COUPON_PATTERN = r'\bcode\s*:?\s*([A-Z0-9]{4,})\b'
+EXPIRY_PATTERN = r'(?:valid till|valid until|expires?)\s+(\d{1,2}-[A-Za-z]{3}-\d{4})'
+BANK_PATTERN = r'\b(HDFC|ICICI|SBI|Axis|Kotak)\b'
+
+
+class RuleExtractor:
+    """
+    A regex-only extractor for short templated messages. It makes no LLM calls,
+    so it can be benchmarked offline as the cheapest possible performance mode.
+    Exposes the same invoke({"text_input": ...}) interface as TieredExtractor.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def _find_vendor(self, text: str):
+        # Longest names first, so 'Uber Eats' wins over 'Uber'.
+        for vendor in sorted(VENDOR_CATEGORIES, key=len, reverse=True):
+            if re.search(rf'\b{re.escape(vendor)}\b', text, re.IGNORECASE):
+                return vendor
+        return None
+
+    def invoke(self, inputs: dict) -> ExtractedInfo:
+        text = inputs["text_input"]
+        self.calls += 1
+
+        transaction_type = 'Info'
+        for candidate, pattern in TRANSACTION_TYPE_PATTERNS:
+            if re.search(pattern, text, re.IGNORECASE):
+                transaction_type = candidate
+                break
+
+        vendor = self._find_vendor(text)
+        if transaction_type == 'Credit':
+            bank = re.search(BANK_PATTERN, text)
+            vendor = f"{bank.group(1)} Bank" if bank else None
+
+        amount = None
+        amount_match = re.search(AMOUNT_PATTERN, text)
+        if amount_match and transaction_type != 'Offer':
+            amount = float(amount_match.group(1).replace(',', ''))
+
+        coupon_match = re.search(COUPON_PATTERN, text, re.IGNORECASE)
+        expiry_match = re.search(EXPIRY_PATTERN, text, re.IGNORECASE)
+        expiry_date = None
+        if expiry_match:
+            expiry_date = datetime.strptime(expiry_match.group(1), '%d-%b-%Y').strftime('%Y-%m-%d')
+
+        if transaction_type == 'Credit':
+            category = 'Finance'
+        else:
+            category = VENDOR_CATEGORIES.get(vendor, 'Other')
+
+        return ExtractedInfo(
+            transaction_type=transaction_type,
+            vendor=vendor,
+            amount=amount,
+            offer_details=None,
+            coupon_code=coupon_match.group(1) if coupon_match else None,
+            expiry_date=expiry_date,
+            category=category,
+        )
+
+    def get_stats(self):
+        """Returns the call count. There are no model tiers, so nothing is escalated."""
+        return {"calls": self.calls, "escalation_rate": 0.0}
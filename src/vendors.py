@@ -0,0 +1,14 @@
+# src/vendors.py
+
+# Known merchants and their spending category. Shared by the golden-set labeler
+# and the offline rule extractor so the two never drift apart.
+VENDOR_CATEGORIES = {
+    'Zomato': 'Food & Dining', 'Swiggy': 'Food & Dining', 'Dominos': 'Food & Dining',
+    'Uber Eats': 'Food & Dining',
+    'Uber': 'Travel', 'Ola': 'Travel', 'Goibibo': 'Travel', 'MakeMyTrip': 'Travel',
+    'Zepto': 'Groceries', 'Blinkit': 'Groceries', 'BigBasket': 'Groceries',
+    'Amazon': 'Shopping', 'Flipkart': 'Shopping', 'Myntra': 'Shopping',
+    'AJIO': 'Shopping', 'Nykaa': 'Shopping',
+    'Jio': 'Bills & Utilities', 'Airtel': 'Bills & Utilities',
+    'Vodafone Idea': 'Bills & Utilities', 'BSES Rajdhani': 'Bills & Utilities',
+}